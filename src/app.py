@@ -1,19 +1,28 @@
 import dash
-from dash import dcc, html, Input, Output, Patch, State
+from dash import dcc, html, Input, Output
 import pandas as pd
+import numpy as np
 import geopandas as gpd
 import plotly.express as px
 import plotly.graph_objects as go
-import json
+import plotly.io as pio
+import orjson
 import requests
-from shapely.geometry import shape
-import warnings
-from functools import lru_cache
+import shapely
+from topojson import Topology
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from flask_caching import Cache
 import os
+import hashlib
+import tempfile
+import gzip
+import brotli
+import flask
 from funcs.get_inc_data import make_query
 from funcs.clean_data import clean_data
 import dash_bootstrap_components as dbc
-import scipy.stats as sps
+from dash.dash_table.Format import Format, Group, Scheme
 # --- Configuration ---
 WFS_BASE_URL = "https://kartta.hel.fi/ws/geoserver/avoindata/wfs"
 LAYER_NAME = "avoindata:Seutukartta_aluejako_pienalue"
@@ -22,13 +31,81 @@ SOURCE_CRS = "EPSG:3879"
 TARGET_CRS = "EPSG:4326"
 MUNICIPALITY_CODES = {'091': 'Helsinki', '049': 'Espoo', '092': 'Vantaa'}
 LOCATION_ID_COL = 'nimi'
-ASSETS_FOLDER = "assets"
+# Absolute, so files are found whatever directory the app is started from
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSETS_FOLDER = os.path.join(APP_DIR, "assets")
+CACHE_FOLDER = os.path.join(APP_DIR, ".cache")
 GEOJSON_FILENAME = "helsinki_regions.json"
+MAP_FIGURE_FILENAME = "map_fig.json"
+# Bump whenever the map figure is built differently (create_animated_map,
+# JUMP_TO_FRAME, ...) so prebuilt figures from older code are not reused
+MAP_FIGURE_VERSION = 1
 AVAILABLE_YEARS = list(range(2005, 2024))
 DEFAULT_YEAR = max(AVAILABLE_YEARS)
 MIN_YEAR = min(AVAILABLE_YEARS)
 MAX_YEAR = max(AVAILABLE_YEARS)
 
+# Serialize figures with orjson's C encoder (fails loudly if it is missing)
+pio.json.config.default_engine = 'orjson'
+
+# Initialize the Dash app
+app = dash.Dash(
+    __name__, 
+    title="Helsinki Region Income Map",
+    compress=True,  # Brotli/gzip-compress layout and callback responses
+    external_stylesheets=[
+        dbc.themes.FLATLY,  # A clean, modern theme
+        "https://fonts.googleapis.com/css2?family=Lato:wght@400;700&family=Montserrat:wght@500;700&display=swap"
+    ]
+)
+app.index_string = '''
+<!DOCTYPE html>
+<html>
+    <head>
+        {%metas%}
+        <title>{%title%}</title>
+        {%favicon%}
+        {%css%}
+        <style>
+            body {
+                font-family: 'Lato', sans-serif;
+                background-color: #f8f9fa;
+                color: #343a40;
+            }
+            h1, h2, h3, h4 {
+                font-family: 'Montserrat', sans-serif;
+                font-weight: 700;
+            }
+            .card {
+                border-radius: 10px;
+                box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+                margin-bottom: 20px;
+            }
+            .navbar-brand {
+                font-weight: 700;
+                font-size: 1.5rem;
+            }
+        </style>
+    </head>
+    <body>
+        {%app_entry%}
+        <footer>
+            {%config%}
+            {%scripts%}
+            {%renderer%}
+        </footer>
+    </body>
+</html>
+'''
+server = app.server  # For deployment
+
+# Shared on-disk cache so every gunicorn worker (and restart) reuses results
+cache = Cache(server, config={
+    'CACHE_TYPE': 'FileSystemCache',
+    'CACHE_DIR': CACHE_FOLDER,
+    'CACHE_DEFAULT_TIMEOUT': 86400
+})
+
 # --- Process & Cache Geospatial Data at Startup ---
 def download_and_optimize_geojson():
     """Download, optimize, and save GeoJSON for future use"""
@@ -55,59 +132,44 @@ def download_and_optimize_geojson():
     }
     
     try:
-        # Download the data
-        response = requests.get(WFS_BASE_URL, params=params)
-        response.raise_for_status()
-        geojson_data = response.json()
-        
-        # Process GeoJSON - filter municipalities and optimize
-        features = geojson_data['features']
-        
-        # Filter features by municipality code
-        filtered_features = []
-        for feature in features:
-            if feature['properties'].get('kunta') in MUNICIPALITY_CODES.keys():
-                filtered_features.append(feature)
-        
-        geojson_data['features'] = filtered_features
-        
-        # Convert to GeoDataFrame for processing
-        properties = [feature['properties'] for feature in filtered_features]
-        geometries = [shape(feature['geometry']) for feature in filtered_features]
-        gdf = gpd.GeoDataFrame(properties, geometry=geometries, crs=SOURCE_CRS)
+        # Filter features by municipality code while parsing, so features of
+        # other municipalities never become Python/shapely objects
+        kunta_filter = "kunta IN ({})".format(
+            ', '.join(f"'{code}'" for code in MUNICIPALITY_CODES)
+        )
         
-        # Reproject to target CRS
-        gdf = gdf.to_crs(TARGET_CRS)
+        # Stream the download to a temporary file so the payload is never
+        # held in memory, then parse it in C (pyogrio) into a GeoDataFrame
+        # (GDAL reopens the file by name, which Windows only allows once it is
+        # closed, hence a temporary directory rather than a NamedTemporaryFile)
+        with requests.get(WFS_BASE_URL, params=params, stream=True) as response, \
+                tempfile.TemporaryDirectory() as tmp_dir:
+            response.raise_for_status()
+            tmp_path = os.path.join(tmp_dir, 'regions.json')
+            with open(tmp_path, 'wb') as tmp:
+                for chunk in response.iter_content(chunk_size=1 << 20):
+                    tmp.write(chunk)
+            gdf = gpd.read_file(tmp_path, engine='pyogrio', where=kunta_filter)
+        gdf = gdf.set_crs(SOURCE_CRS, allow_override=True)
         
-        # Simplify geometries for better performance
-        gdf['geometry'] = gdf['geometry'].simplify(tolerance=0.00001, preserve_topology=True)
+        # Reproject to target CRS, keeping only the essential properties
+        gdf = gdf[['nimi', 'kunta', 'geometry']].to_crs(TARGET_CRS)
         
-        # Convert back to GeoJSON but with reduced precision
-        optimized_geojson = json.loads(gdf.to_json())
+        # Snap the regions onto a shared, quantized topology so neighbouring
+        # regions have identical borders
+        gdf = Topology(gdf, prequantize=1e5).to_gdf(crs=TARGET_CRS)
         
-        # Reduce precision of coordinates to 5 decimal places
-        for feature in optimized_geojson['features']:
-            if feature['geometry']['type'] == 'Polygon':
-                for ring in feature['geometry']['coordinates']:
-                    for coord in ring:
-                        coord[0] = round(coord[0], 6)
-                        coord[1] = round(coord[1], 6)
-            elif feature['geometry']['type'] == 'MultiPolygon':
-                for polygon in feature['geometry']['coordinates']:
-                    for ring in polygon:
-                        for coord in ring:
-                            coord[0] = round(coord[0], 6)
-                            coord[1] = round(coord[1], 6)
+        # Simplify the regions as one coverage (Visvalingam-Whyatt in GEOS), so
+        # shared borders are simplified once and no gaps open between them.
+        # The tolerance is in degrees, roughly 5-10 m here.
+        gdf['geometry'] = shapely.coverage_simplify(gdf.geometry.values, tolerance=1e-4)
         
-        # Remove unnecessary properties to reduce file size
-        for feature in optimized_geojson['features']:
-            # Keep only essential properties
-            essential_props = {'nimi', 'kunta'}
-            feature['properties'] = {k: v for k, v in feature['properties'].items() if k in essential_props}
+        # Reduce precision of coordinates to 6 decimal places (vectorised in GEOS)
+        gdf['geometry'] = shapely.set_precision(gdf.geometry.values, grid_size=1e-6)
         
         # Save optimized GeoJSON
-        with open(geojson_path, 'w') as f:
-            json.dump(optimized_geojson, f)
+        with open(geojson_path, 'wb') as f:
+            f.write(orjson.dumps(gdf.to_geo_dict(drop_id=True)))
         
         print(f"Optimized GeoJSON saved to {geojson_path}")
         return geojson_path
@@ -117,7 +179,7 @@ def download_and_optimize_geojson():
         return None
 
 # --- Load Income Data ---
-@lru_cache(maxsize=1)
+@cache.memoize()
 def get_income_data():
     """Load income data with caching"""
     from funcs.get_inc_data import make_query
@@ -140,93 +202,120 @@ def prepare_data():
     
     # Prepare a dataframe with just the regions and their income values
     #print(income_data.columns)
-    income_cols = list(map(str,AVAILABLE_YEARS))
-    income_cols.append('AlueNimi')
-    return income_data[income_cols].copy()
+    year_cols = list(map(str,AVAILABLE_YEARS))
+    income_cols = year_cols + ['AlueNimi']
+    # Year columns already arrive as float32 from make_query
+    return income_data[income_cols]
+
+# Precompressed variants of static assets, in order of preference
+COMPRESSED_ENCODINGS = {
+    'br': ('.br', lambda data: brotli.compress(data, quality=11)),
+    'gzip': ('.gz', lambda data: gzip.compress(data, compresslevel=9)),
+}
+
+def write_file_atomic(path, data):
+    """Write bytes to a temporary file next to path, then move it into place"""
+    # Readers (and other workers) only ever see a missing or complete file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        # mkstemp creates the file as 0600; give it the permissions a plain
+        # open() would, so other users (e.g. a static file server) can read it
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def write_compressed_copies(path):
+    """Write Brotli and gzip compressed copies of a static asset next to it"""
+    compressed_paths = {}
+    for encoding, (suffix, compress) in COMPRESSED_ENCODINGS.items():
+        compressed_path = path + suffix
+        # Only recompress when the source is newer than the existing copy
+        if (not os.path.exists(compressed_path)
+                or os.path.getmtime(compressed_path) < os.path.getmtime(path)):
+            with open(path, 'rb') as src:
+                write_file_atomic(compressed_path, compress(src.read()))
+        compressed_paths[encoding] = compressed_path
+    return compressed_paths
+
+def versioned_asset_url(path):
+    """Asset URL with a short content hash of the file in its name"""
+    with open(path, 'rb') as f:
+        digest = hashlib.sha1(f.read()).hexdigest()[:8]
+    stem, ext = os.path.splitext(os.path.basename(path))
+    return f"/assets/{stem}.{digest}{ext}"
 
 # --- Initialize App Components ---
 # Download and optimize GeoJSON at startup
-geojson_path = download_and_optimize_geojson()
+# The WFS download and the income query are independent network round trips,
+# so run them side by side
+with ThreadPoolExecutor(max_workers=2) as executor:
+    geojson_future = executor.submit(download_and_optimize_geojson)
+    income_future = executor.submit(prepare_data)
+    geojson_path = geojson_future.result()
+    income_df = income_future.result()
 
-# Prepare income data
-income_df = prepare_data()
+# Precompress the GeoJSON once so it is never compressed per request
+geojson_compressed = write_compressed_copies(geojson_path) if geojson_path is not None else {}
 
-# Initialize the Dash app
-app = dash.Dash(
-    __name__, 
-    title="Helsinki Region Income Map",
-    external_stylesheets=[
-        dbc.themes.FLATLY,  # A clean, modern theme
-        "https://fonts.googleapis.com/css2?family=Lato:wght@400;700&family=Montserrat:wght@500;700&display=swap"
-    ]
-)
-app.index_string = '''
-<!DOCTYPE html>
-<html>
-    <head>
-        {%metas%}
-        <title>{%title%}</title>
-        {%favicon%}
-        {%css%}
-        <style>
-            body {
-                font-family: 'Lato', sans-serif;
-                background-color: #f8f9fa;
-                color: #343a40;
-            }
-            h1, h2, h3, h4 {
-                font-family: 'Montserrat', sans-serif;
-                font-weight: 700;
-            }
-            .card {
-                border-radius: 10px;
-                box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-                margin-bottom: 20px;
-            }
-            .navbar-brand {
-                font-weight: 700;
-                font-size: 1.5rem;
-            }
-        </style>
-    </head>
-    <body>
-        {%app_entry%}
-        <footer>
-            {%config%}
-            {%scripts%}
-            {%renderer%}
-        </footer>
-    </body>
-</html>
-'''
-server = app.server  # For deployment
+# The content hash changes whenever the file is regenerated, so browsers and
+# CDNs may cache the versioned URL forever
+geojson_url = versioned_asset_url(geojson_path) if geojson_path is not None else None
+
+def serve_geojson():
+    """Serve the region GeoJSON, precompressed when the browser accepts it"""
+    # Highest client quality wins, ties go to the first (smallest) encoding,
+    # and encodings sent with q=0 are never picked. The GeoJSON media type
+    # keeps Flask-Compress off this route, since it would recompress the plain
+    # fallback even with an encoding the client refused
+    encoding = flask.request.accept_encodings.best_match(geojson_compressed)
+    if encoding is not None:
+        response = flask.send_file(geojson_compressed[encoding], mimetype='application/geo+json')
+        response.headers['Content-Encoding'] = encoding
+    else:
+        response = flask.send_file(geojson_path, mimetype='application/geo+json')
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+if geojson_url is not None:
+    server.add_url_rule(geojson_url, view_func=serve_geojson)
+
+
+# Animation options for jumping straight to a frame (slider steps, Pause),
+# shared by every step instead of rebuilding the same dict per year
+JUMP_TO_FRAME = {
+    'frame': {'duration': 0, 'redraw': True},
+    'mode': 'immediate',
+    'transition': {'duration': 0}
+}
 
 # Create and cache the initial map with animation frames
 def create_animated_map():
     """Create a map with animation frames for all years"""
     
-    if geojson_path is None or income_df is None:
+    if geojson_url is None or income_df is None:
         return px.scatter(title="Error loading data")
     
-    # Load GeoJSON from file to ensure it's available
-    try:
-        with open(geojson_path, 'r') as f:
-            geojson_data = json.load(f)
-    except Exception as e:
-        print(f"Error loading GeoJSON: {str(e)}")
-        return px.scatter(title=f"Error loading GeoJSON: {str(e)}")
-    
-    # Create a base figure
-    fig = go.Figure()
-    
-    # Create frames for each year
-    frames = []
+    # Region names and a contiguous (year x region) float32 income matrix,
+    # so every frame takes a row view instead of materializing a Series
+    locations = income_df['AlueNimi'].to_numpy()
+    Z = np.ascontiguousarray(
+        income_df[[str(year) for year in AVAILABLE_YEARS]].to_numpy(dtype=np.float32).T
+    )
     
     # Add a choropleth trace for each year
     base_trace = go.Choroplethmapbox(
-        geojson=geojson_data,
-        locations=income_df['AlueNimi'],
-        z=income_df[str(MAX_YEAR)],
+        # Plotly fetches the GeoJSON from this (cacheable) URL itself, so the
+        # polygons are not embedded in the figure
+        geojson=geojson_url,
+        locations=locations,
+        z=Z[-1],
         featureidkey="properties.nimi",
         colorscale="speed",
         zmin=10000,
@@ -247,18 +336,16 @@ def create_animated_map():
     # Create the figure with the base trace
     fig = go.Figure(data=[base_trace])
 
-    # Create animation frames with only updated 'z' values
-    frames = []
-    for year in AVAILABLE_YEARS:
-        frames.append(go.Frame(
-            data=[go.Choroplethmapbox(
-                z=income_df[str(year)],
-                locations=income_df['AlueNimi']
-            )],
+    # Create animation frames with only updated 'z' values; locations are
+    # identical for every year and are inherited from the base trace
+    fig.frames = [
+        go.Frame(
+            data=[go.Choroplethmapbox(z=z)],
             name=str(year),
             layout=dict(title_text=f"{year}")
-        ))
-    fig.frames = frames
+        )
+        for year, z in zip(AVAILABLE_YEARS, Z)
+    ]
 
     # Define slider steps
     sliders = [{
@@ -278,14 +365,7 @@ def create_animated_map():
         'y': 0,
         'steps': [
             {
-                'args': [
-                    [str(year)],
-                    {
-                        'frame': {'duration': 0, 'redraw': True},
-                        'mode': 'immediate',
-                        'transition': {'duration': 0}
-                    }
-                ],
+                'args': [[str(year)], JUMP_TO_FRAME],
                 'label': str(year),
                 'method': 'animate'
             }
@@ -309,14 +389,7 @@ def create_animated_map():
                 'method': 'animate'
             },
             {
-                'args': [
-                    [None],
-                    {
-                        'frame': {'duration': 0, 'redraw': True},
-                        'mode': 'immediate',
-                        'transition': {'duration': 0}
-                    }
-                ],
+                'args': [[None], JUMP_TO_FRAME],
                 'label': 'Pause',
                 'method': 'animate'
             }
@@ -347,14 +420,52 @@ def create_animated_map():
     )
 
     return fig
-areanames = income_df['AlueNimi'].unique().tolist()
-data = income_df.copy()
-data_pivoted = data.transpose()
-data_pivoted.columns = data_pivoted.iloc[-1]
-data_pivoted.drop(data_pivoted.index[-1], inplace=True)
-data_pivoted.reset_index(inplace=True)
-data_pivoted.rename(columns={'index': 'Year'}, inplace=True)
+
+def map_figure_fingerprint():
+    """Hash of everything the map figure is built from"""
+    digest = hashlib.sha1()
+    digest.update(str(geojson_url).encode())
+    digest.update(np.asarray(AVAILABLE_YEARS).tobytes())
+    if income_df is not None:
+        digest.update('\0'.join(income_df['AlueNimi']).encode())
+        digest.update(income_df[[str(year) for year in AVAILABLE_YEARS]].to_numpy(np.float32).tobytes())
+    digest.update(str(MAP_FIGURE_VERSION).encode())
+    return digest.hexdigest()
+
+@functools.cache
+def get_map_figure():
+    """Load the prebuilt map figure, or build it once and cache it"""
+    # Prefer the figure written at deploy time by build.py, as long as it was
+    # built from the same GeoJSON, income data, years and code
+    fig_path = os.path.join(ASSETS_FOLDER, MAP_FIGURE_FILENAME)
+    if os.path.exists(fig_path):
+        with open(fig_path, 'rb') as f:
+            prebuilt = orjson.loads(f.read())
+        if prebuilt.get('fingerprint') == map_figure_fingerprint():
+            return prebuilt['figure']
+    
+    # Plotly's JSON encoding of the 19 frames is the expensive part, so do it
+    # once and hand Dash a plain dict on every page load
+    return orjson.loads(pio.to_json(create_animated_map()))
+
+# Sorted once so the dropdown order is stable
+areanames = sorted(income_df['AlueNimi'].unique().tolist())
+# Year x area table: one row per year, one column per area, built with a
+# single transpose of the contiguous income matrix
+data_pivoted = pd.DataFrame(
+    income_df[[str(y) for y in AVAILABLE_YEARS]].to_numpy().T,
+    index=pd.Index(np.array(AVAILABLE_YEARS, dtype=np.int16), name='Year'),
+    columns=income_df['AlueNimi'].to_numpy()
+).reset_index()
 print(data_pivoted.head())
+
+# Per-area income series as plain arrays so callbacks avoid pandas indexing
+YEARS = np.asarray(AVAILABLE_YEARS)
+AREA_Y = {
+    col: data_pivoted[col].to_numpy(dtype=np.float32)
+    for col in data_pivoted.columns if col != 'Year'
+}
+
 # App Layout
 app.layout = dbc.Container([
     html.Br(),
@@ -389,8 +500,11 @@ app.layout = dbc.Container([
                         type="circle",
                         children=[
                             # The map with animation controls
+                            # Built once at startup and shipped with the
+                            # layout, so no load-time callback is needed
                             dcc.Graph(
                                 id='income-map',
+                                figure=get_map_figure(),
                                 style={'height': '800px'},
                                 config={
                                     'scrollZoom': True,
@@ -415,7 +529,7 @@ app.layout = dbc.Container([
                         dbc.Col([
                             dcc.Dropdown(
                                 id='area-input',
-                                options=[{'label': area, 'value': area} for area in areanames],
+                                options=areanames,
                                 multi=True,
                                 value=['Jollas'],
                                 placeholder="Select areas to compare...",
@@ -465,36 +579,28 @@ app.layout = dbc.Container([
     
 ], fluid=True, className="px-4")
 
-# Callback to initialize the map
-@app.callback(
-    Output('income-map', 'figure'),
-    Input('income-map', 'id')  # Dummy input to trigger on load
-)
-def init_map(_):
-    return create_animated_map()
-
-
 @app.callback(
     Output('income-line-chart', 'figure'),
     Input('area-input', 'value'),
 )
 def update_line_chart(area_names_selected):
-    
-    
-    
-    fig = go.Figure()
     if not isinstance(area_names_selected, list):
         area_names_selected = [area_names_selected]
     
+    return build_line_chart(area_names_selected)
+
+def build_line_chart(area_names_selected):
+    """Build the income trend chart for the selected areas"""
     # Add trace for each selected area
-    for area in area_names_selected:
-        if area in data_pivoted.columns:
-            fig.add_trace(go.Scatter(
-                x=AVAILABLE_YEARS,
-                y=data_pivoted[area],
-                mode='lines+markers',
-                name=area
-            ))
+    fig = go.Figure(data=[
+        go.Scatter(
+            x=YEARS,
+            y=AREA_Y[area],
+            mode='lines+markers',
+            name=area
+        )
+        for area in area_names_selected if area in AREA_Y
+    ])
     
     # Set chart title
     title = f"Income Trends for {', '.join(area_names_selected)}"
@@ -533,48 +639,60 @@ def update_data_table(n_clicks, areas):
     # Ensure list format
     area_names_selected = [areas] if isinstance(areas, str) else areas
 
+    return build_data_table(tuple(area_names_selected))
+
+# Cached per process only: the tables are built from this process's income_df,
+# so they can never disagree with the map and line chart
+@functools.lru_cache(maxsize=128)
+def build_data_table(area_names_selected):
+    """Build the summary and raw data tables for a tuple of areas (cached)"""
+    area_names_selected = list(area_names_selected)
+
     try:
         selected_data = data_pivoted[['Year'] + area_names_selected]
     except Exception as e:
         return html.Div(f"Error selecting data: {str(e)}")
 
-    # Compute summary statistics per area
-    summary_rows = []
+    # Compute summary statistics for all areas at once on a (year x area) matrix
     n_years = MAX_YEAR - MIN_YEAR
+    years = selected_data['Year'].to_numpy()
+    values = selected_data[area_names_selected].to_numpy(dtype=np.float64)
+    columns = np.arange(values.shape[1])
 
-    for area in area_names_selected:
-        series = selected_data[area]
-        series = series.dropna()
-        start_val = series.iloc[0]
-        end_val = series.iloc[-1]
+    # First and last year with data for each area
+    has_data = ~np.isnan(values)
+    start_vals = values[has_data.argmax(axis=0), columns]
+    end_vals = values[len(values) - 1 - has_data[::-1].argmax(axis=0), columns]
 
-        if start_val > 0 and end_val > 0:
-            cagr = ((end_val / start_val) ** (1 / n_years) - 1) * 100
-        else:
-            cagr = None
-
-        trend = end_val - start_val
-        best_year = selected_data.loc[series.idxmax(), 'Year']
-        worst_year = selected_data.loc[series.idxmin(), 'Year']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cagr = np.where(
+            (start_vals > 0) & (end_vals > 0),
+            ((end_vals / start_vals) ** (1 / n_years) - 1) * 100,
+            np.nan
+        )
+    trend = end_vals - start_vals
+    best_years = years[np.nanargmax(values, axis=0)]
+    worst_years = years[np.nanargmin(values, axis=0)]
 
-        summary_rows.append({
+    summary_rows = [
+        {
             'Area': area,
-            'CAGR (%)': f"{cagr:.2f}" if cagr is not None else "N/A",
-            'Overall Growth (€)': f"{trend:,.0f}",
-            'Best Year': best_year,
-            'Worst Year': worst_year
-        })
-    renamed_data = selected_data.copy()
-    
-    renamed_data.columns = [
-        'Year' if col == 'Year' else f"{col} Median household taxpayer income (€)"
-        for col in renamed_data.columns
+            'CAGR (%)': f"{area_cagr:.2f}" if not np.isnan(area_cagr) else "N/A",
+            'Overall Growth (€)': f"{area_trend:,.0f}",
+            'Best Year': int(best_year),
+            'Worst Year': int(worst_year)
+        }
+        for area, area_cagr, area_trend, best_year, worst_year
+        in zip(area_names_selected, cagr, trend, best_years, worst_years)
     ]
-    for col in renamed_data.columns:
-        if col != 'Year':
-            renamed_data[col] = renamed_data[col].apply(
-                lambda x: f"{x:,.0f}" if pd.notnull(x) else ""
-            )
+    renamed_data = selected_data.rename(columns={
+        area: f"{area} Median household taxpayer income (€)"
+        for area in area_names_selected
+    })
+    
+    # Incomes are sent as numbers and formatted with thousands separators in
+    # the browser, so there is no per-cell string formatting here
+    income_format = Format(precision=0, scheme=Scheme.fixed, group=Group.yes)
 
     return html.Div([
         html.Br(),
@@ -601,7 +719,11 @@ def update_data_table(n_clicks, areas):
         dash.dash_table.DataTable(
             id='raw-data-table',
             data=renamed_data.to_dict('records'),
-            columns=[{'name': col, 'id': col} for col in renamed_data.columns],
+            columns=[
+                {'name': col, 'id': col} if col == 'Year'
+                else {'name': col, 'id': col, 'type': 'numeric', 'format': income_format}
+                for col in renamed_data.columns
+            ],
             style_table={'overflowX': 'auto'},
             style_cell={'textAlign': 'left', 'padding': '5px'},
             style_header={
@@ -0,0 +1,29 @@
+"""Prebuild the animated map figure so no request has to build it.
+
+Run from the src directory at deploy time: python build.py
+"""
+import os
+import orjson
+
+
+if __name__ == '__main__':
+    # The prebuilt figure is only a shortcut, so never fail the deploy over
+    # it: without the file the app builds the figure itself
+    try:
+        import app
+    except Exception as e:
+        app = None
+        print(f"Error loading the app: {str(e)}")
+    
+    # Don't persist the error figure when the data could not be loaded
+    if app is None or app.geojson_url is None or app.income_df is None:
+        print("Map data could not be loaded, no prebuilt figure written")
+    else:
+        # Importing app already built (or loaded) the figure for the layout
+        fig_path = os.path.join(app.ASSETS_FOLDER, app.MAP_FIGURE_FILENAME)
+        with open(fig_path, 'wb') as f:
+            f.write(orjson.dumps({
+                'fingerprint': app.map_figure_fingerprint(),
+                'figure': app.get_map_figure(),
+            }))
+        print(f"Prebuilt map figure saved to {fig_path}")
@@ -10,13 +10,11 @@ def clean_data(df):
     """
     mask = df['Alue'].str.contains('piiri') == False
     df = df[mask]
-    Aluecol = df['Alue'].str.split(' ', n=2, expand=True)
-    mask2 = Aluecol[1].str.isnumeric()
-    df = df[mask2]
-    Aluecol=Aluecol[mask2]
-    df['AlueNum'] = Aluecol[1]
-    df['AlueNimi'] = Aluecol[2]
-    df = df.drop(columns=['Alue'])
-    df['KuntaNum'] = Aluecol[0]
+    # Split "<kunta> <area number> <area name>" in a single regex pass; rows
+    # without a numeric area number (municipality totals) drop out
+    parts = df['Alue'].str.extract(
+        r'^(?P<KuntaNum>[^ ]*) (?P<AlueNum>\d+)(?: (?P<AlueNimi>.*))?$'
+    )
+    df = df.join(parts).dropna(subset=['AlueNum']).drop(columns=['Alue'])
     print('Done cleaning data')
     return df
@@ -4,6 +4,8 @@ from io import StringIO
 import numpy as np
 # URL for the table
 url = "https://stat.hel.fi:443/api/v1/fi/Aluesarjat/tul/astul/alu_astul_006f.px"
+# Shared session so repeated queries reuse the pooled keep-alive connection
+session = requests.Session()
 
 # Example query - you'll need to adjust based on the actual metadata
 def make_query(years):
@@ -32,20 +34,24 @@ def make_query(years):
     }
 
     # Make the POST request
-    response = requests.post(url, json=query)
+    response = session.post(url, json=query)
     # Check if the request was successful
     if response.status_code == 200:
         #print(response.text)
-        df = pd.read_csv(StringIO(response.text), sep=",")
+        # '..' marks missing values; parsing it as NaN lets the C parser
+        # produce numeric year columns directly
+        df = pd.read_csv(StringIO(response.text), sep=",", na_values=['..'])
         
         placeholder = [df.columns[i].split(' ')[0] for i in range(len(df.columns))]
         
         
         df.columns = placeholder
-        df.replace('..',np.nan,inplace=True)
         df.dropna(how='all',inplace=True)
 
-        df[years] = df[years].astype(float)
+        # Columns without any missing value parse as int64. Incomes are whole
+        # euros well below 2**24, so float32 stores them exactly in half the
+        # memory; NaN still marks missing years
+        df[years] = df[years].astype(np.float32)
         #print(df.head(), "\n")
     else:
         print(f"Error: {response.status_code}")
@@ -53,4 +59,5 @@ def make_query(years):
         df = pd.DataFrame()  # Return an empty DataFrame on error
     print('Done making query')
     return df
-make_query(["2022","2021"])
\ No newline at end of file
+if __name__ == '__main__':
+    make_query(["2022","2021"])